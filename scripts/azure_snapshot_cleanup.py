@@ -5,17 +5,40 @@ import datetime
 import json
 import logging
 import os
+import queue
+import re
 import sys
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Deque, Dict, FrozenSet, Iterator, List, Tuple, Optional, Any
 
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential, ClientSecretCredential
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from azure.core.pipeline.transport import RequestsTransport
+from azure.identity import (
+    DefaultAzureCredential, ManagedIdentityCredential, ClientSecretCredential, TokenCachePersistenceOptions
+)
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.resource import ResourceManagementClient, SubscriptionClient
-from azure.core.exceptions import AzureError
+from azure.mgmt.resourcegraph import ResourceGraphClient
+from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+from azure.core.exceptions import AzureError, HttpResponseError, ResourceNotFoundError
 try:
     from tabulate import tabulate
 except ImportError:
     tabulate = None
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +48,170 @@ logging.basicConfig(
 )
 logger = logging.getLogger('azure-snapshot-cleanup')
 
+# ARM resource ID: /subscriptions/{sub}/resourceGroups/{rg}/providers/{namespace}/{type}/{name}
+RESOURCE_ID_PATTERN = re.compile(
+    r"^/subscriptions/([^/]+)/resourceGroups/([^/]+)/providers/([^/]+)/([^/]+)/([^/]+)$",
+    re.IGNORECASE
+)
+
+# Default concurrency for scans. Lower these if ARM starts throttling (HTTP 429).
+DEFAULT_SUBSCRIPTION_WORKERS = 8
+DEFAULT_DISK_WORKERS = 32
+
+# Upper bound on concurrent disk lookups across all scan threads
+DEFAULT_MAX_IN_FLIGHT = 64
+
+# Disk lookups persisted between runs. Disks that exist rarely vanish and
+# missing disks almost never reappear, so negative answers are kept longer.
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'azure-snap-cleanup')
+DEFAULT_CACHE_TTL_EXISTS = 3600
+DEFAULT_CACHE_TTL_MISSING = 86400
+
+# Snapshots buffered between the page reader and the disk check workers
+SNAPSHOT_QUEUE_SIZE = 1000
+
+# Concurrent deletions per subscription, and how long to wait for each one
+DEFAULT_DELETE_WORKERS = 16
+DEFAULT_DELETE_TIMEOUT = 600
+
+# Deletions started per minute per subscription (ARM write limit), and how
+# often a throttled deletion is retried after waiting out its Retry-After
+DEFAULT_DELETE_RATE = 600
+DELETE_THROTTLE_RETRIES = 3
+DEFAULT_RETRY_AFTER = 30
+
+# Connection pool and timeouts (seconds) shared by all Azure clients
+HTTP_POOL_CONNECTIONS = 64
+HTTP_POOL_MAXSIZE = 128
+HTTP_CONNECTION_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 30
+
+# Pipeline retries; the Azure retry policy honours Retry-After on 429/503
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+
+# Name of the persistent MSAL token cache, enabled with AZURE_TOKEN_CACHE=1
+TOKEN_CACHE_NAME = "azsnap"
+
+# Resource Graph returns at most 1000 rows per page
+RESOURCE_GRAPH_PAGE_SIZE = 1000
+
+# Only snapshots copied from a disk can lose their source disk; Import/Upload
+# snapshots have none
+COPY_CREATE_OPTION = 'Copy'
+
+# Snapshots whose source disk is not among the existing disks, joined server-side
+ORPHANED_SNAPSHOTS_QUERY = f"""
+Resources
+| where type =~ 'microsoft.compute/snapshots'
+| where tostring(properties.creationData.createOption) =~ '{COPY_CREATE_OPTION}'
+| extend sourceResourceId = tostring(properties.creationData.sourceResourceId)
+| where isnotempty(sourceResourceId)
+| extend sourceDiskId = tolower(sourceResourceId)
+| join kind=leftouter (
+    Resources
+    | where type =~ 'microsoft.compute/disks'
+    | project diskId = tolower(id)
+) on $left.sourceDiskId == $right.diskId
+| where isempty(diskId)
+| project id, name, subscriptionId, tags, sourceResourceId,
+    diskSizeGB = toint(properties.diskSizeGB),
+    timeCreated = tostring(properties.timeCreated)
+"""
+
+
+def normalize_resource_id(resource_id: str) -> str:
+    """
+    Normalize an ARM resource ID for comparisons
+    
+    ARM resource IDs are case-insensitive and the same IDs repeat across many
+    snapshots, so the lower-cased form is interned.
+    
+    Args:
+        resource_id: ARM resource ID
+        
+    Returns:
+        Interned, lower-cased resource ID
+    """
+    return sys.intern(resource_id.lower())
+
+
+def intern_tags(tags: Dict[str, str]) -> Dict[str, str]:
+    """
+    Intern the keys of a tag dictionary, which repeat across most snapshots
+    
+    Args:
+        tags: Resource tags
+        
+    Returns:
+        Tags with interned keys
+    """
+    return {sys.intern(key): value for key, value in tags.items()}
+
+
+def get_retry_after(error: HttpResponseError) -> float:
+    """
+    Get the delay requested by a throttled ARM response
+    
+    Args:
+        error: Error raised for the throttled request
+        
+    Returns:
+        Seconds to wait before retrying
+    """
+    response = error.response
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return max(float(retry_after), 0)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing a fixed number of operations per period"""
+
+    def __init__(self, rate: int, period: float = 60):
+        """
+        Initialize the token bucket
+        
+        Args:
+            rate: Number of operations allowed per period, also the burst size
+            period: Length of the period in seconds (default: 60)
+        """
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+                self.updated_at = now
+                
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hand out no tokens for the given time, e.g. while ARM is throttling
+        
+        Args:
+            seconds: How long to pause
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
 
 class AzureSnapshotManager:
     """Manages Azure snapshots across subscriptions"""
@@ -33,7 +220,17 @@ class AzureSnapshotManager:
         self,
         credential,
         subscription_id: str = None,
-        log_level: str = "INFO"
+        log_level: str = "INFO",
+        subscription_workers: int = DEFAULT_SUBSCRIPTION_WORKERS,
+        disk_workers: int = DEFAULT_DISK_WORKERS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        delete_workers: int = DEFAULT_DELETE_WORKERS,
+        delete_timeout: int = DEFAULT_DELETE_TIMEOUT,
+        delete_rate: int = DEFAULT_DELETE_RATE,
+        use_cache: bool = True,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        cache_ttl_exists: int = DEFAULT_CACHE_TTL_EXISTS,
+        cache_ttl_missing: int = DEFAULT_CACHE_TTL_MISSING
     ):
         """
         Initialize the snapshot manager
@@ -42,26 +239,106 @@ class AzureSnapshotManager:
             credential: Azure credential object
             subscription_id: Specific subscription ID to use (optional)
             log_level: Logging level (default: INFO)
+            subscription_workers: Number of subscriptions scanned concurrently
+            disk_workers: Number of concurrent disk lookups per subscription
+            max_in_flight: Maximum number of disk lookups in flight across all subscriptions
+            delete_workers: Number of concurrent deletions per subscription
+            delete_timeout: Seconds to wait for a single deletion to complete
+            delete_rate: Maximum number of deletions started per minute per subscription
+            use_cache: Persist disk lookups between runs (requires diskcache)
+            cache_dir: Directory of the persistent disk lookup cache
+            cache_ttl_exists: Seconds a cached "disk exists" answer stays valid
+            cache_ttl_missing: Seconds a cached "disk missing" answer stays valid
         """
         self.credential = credential
         self.specific_subscription_id = subscription_id
+        self.subscription_workers = subscription_workers
+        self.disk_workers = disk_workers
+        self.delete_workers = delete_workers
+        self.delete_timeout = delete_timeout
+        self.delete_rate = delete_rate
+        
+        # The nested thread pools can run far more lookups than ARM tolerates
+        # before throttling, so cap the number of requests actually on the wire
+        self._request_slots = threading.BoundedSemaphore(max_in_flight)
         
         # Set logging level
         logger.setLevel(getattr(logging, log_level))
         
+        # Share one HTTP session between all clients so connections (and their
+        # TLS handshakes) are reused across subscriptions. Retries are left to
+        # the Azure pipeline, as in the SDK's default transport.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=False, redirect=False, raise_on_status=False)
+        ))
+        self.transport = RequestsTransport(
+            session=self.session,
+            session_owner=False,
+            connection_timeout=HTTP_CONNECTION_TIMEOUT,
+            read_timeout=HTTP_READ_TIMEOUT
+        )
+        
+        # Pipeline options for every client: shared transport, no HTTP
+        # logging and fewer, quicker retries than the SDK defaults
+        self._client_options = {
+            'transport': self.transport,
+            'logging_enable': False,
+            'retry_total': RETRY_TOTAL,
+            'retry_backoff_factor': RETRY_BACKOFF_FACTOR
+        }
+        
         # Initialize clients
-        self.subscription_client = SubscriptionClient(self.credential)
+        self.subscription_client = SubscriptionClient(self.credential, **self._client_options)
+        self.resource_graph_client = ResourceGraphClient(self.credential, **self._client_options)
         
         # Store compute clients for each subscription
         self.compute_clients = {}
         self.resource_clients = {}
+        self._client_lock = threading.Lock()
         
-        # Cache for disk lookups
+        # Cache for disk lookups (shared by the scan worker threads)
         self.disk_cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # Persistent cache for disk lookups across runs (optional)
+        self.persistent_cache = None
+        self.cache_ttl_exists = cache_ttl_exists
+        self.cache_ttl_missing = cache_ttl_missing
+        if use_cache:
+            if diskcache:
+                self.persistent_cache = diskcache.Cache(os.path.expanduser(cache_dir))
+            else:
+                logger.debug("diskcache is not installed, disk lookups will not be cached between runs")
+        
+        # Existence of resource groups, keyed by (subscription ID, lower-cased name)
+        self.rg_exists_cache: Dict[Tuple[str, str], bool] = {}
         
         # Results storage
         self.orphaned_snapshots = []
 
+    def __enter__(self) -> 'AzureSnapshotManager':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all Azure clients and the shared HTTP session"""
+        with self._client_lock:
+            clients = list(self.compute_clients.values()) + list(self.resource_clients.values())
+            self.compute_clients = {}
+            self.resource_clients = {}
+        
+        for client in clients + [self.subscription_client, self.resource_graph_client]:
+            client.close()
+        self.session.close()
+        
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+
     def get_subscriptions(self) -> List[Dict]:
         """
         Get list of accessible subscriptions
@@ -72,7 +349,7 @@ class AzureSnapshotManager:
         subscriptions = []
         
         if self.specific_subscription_id:
-            logger.info(f"Using specific subscription: {self.specific_subscription_id}")
+            logger.info("Using specific subscription: %s", self.specific_subscription_id)
             subscription_detail = self.subscription_client.subscriptions.get(self.specific_subscription_id)
             subscriptions = [{
                 'id': subscription_detail.subscription_id,
@@ -83,7 +360,7 @@ class AzureSnapshotManager:
             subscription_list = list(self.subscription_client.subscriptions.list())
             subscriptions = [{'id': sub.subscription_id, 'name': sub.display_name} for sub in subscription_list]
             
-        logger.info(f"Found {len(subscriptions)} accessible subscription(s)")
+        logger.info("Found %d accessible subscription(s)", len(subscriptions))
         return subscriptions
 
     def _get_compute_client(self, subscription_id: str) -> ComputeManagementClient:
@@ -96,11 +373,12 @@ class AzureSnapshotManager:
         Returns:
             ComputeManagementClient for the subscription
         """
-        if subscription_id not in self.compute_clients:
-            self.compute_clients[subscription_id] = ComputeManagementClient(
-                self.credential, subscription_id
-            )
-        return self.compute_clients[subscription_id]
+        with self._client_lock:
+            if subscription_id not in self.compute_clients:
+                self.compute_clients[subscription_id] = ComputeManagementClient(
+                    self.credential, subscription_id, **self._client_options
+                )
+            return self.compute_clients[subscription_id]
 
     def _get_resource_client(self, subscription_id: str) -> ResourceManagementClient:
         """
@@ -112,11 +390,108 @@ class AzureSnapshotManager:
         Returns:
             ResourceManagementClient for the subscription
         """
-        if subscription_id not in self.resource_clients:
-            self.resource_clients[subscription_id] = ResourceManagementClient(
-                self.credential, subscription_id
-            )
-        return self.resource_clients[subscription_id]
+        with self._client_lock:
+            if subscription_id not in self.resource_clients:
+                self.resource_clients[subscription_id] = ResourceManagementClient(
+                    self.credential, subscription_id, **self._client_options
+                )
+            return self.resource_clients[subscription_id]
+
+    def _query_resource_graph(self, subscription_ids: List[str], query: str) -> Iterator[Dict]:
+        """
+        Run a Resource Graph query across subscriptions, following $skipToken
+        
+        Args:
+            subscription_ids: Azure subscription IDs to query
+            query: KQL query to run
+            
+        Returns:
+            Iterator over the result rows as dictionaries
+        """
+        skip_token = None
+        while True:
+            response = self.resource_graph_client.resources(QueryRequest(
+                subscriptions=subscription_ids,
+                query=query,
+                options=QueryRequestOptions(
+                    top=RESOURCE_GRAPH_PAGE_SIZE,
+                    skip_token=skip_token,
+                    result_format="objectArray"
+                )
+            ))
+            yield from response.data
+            skip_token = response.skip_token
+            if not skip_token:
+                return
+
+    def _get_persisted_lookup(self, cache_key: str) -> Optional[bool]:
+        """
+        Get a disk lookup persisted by a previous run, if still fresh
+        
+        Args:
+            cache_key: Disk lookup cache key
+            
+        Returns:
+            Cached existence of the disk, or None if unknown or expired
+        """
+        if self.persistent_cache is None:
+            return None
+            
+        entry = self.persistent_cache.get(cache_key)
+        if entry is None:
+            return None
+            
+        exists, checked_at = entry
+        ttl = self.cache_ttl_exists if exists else self.cache_ttl_missing
+        if time.time() - checked_at >= ttl:
+            return None
+        return exists
+
+    def _persist_lookup(self, cache_key: str, exists: bool) -> None:
+        """
+        Persist a disk lookup for later runs
+        
+        Args:
+            cache_key: Disk lookup cache key
+            exists: Whether the disk exists
+        """
+        if self.persistent_cache is None:
+            return
+            
+        # Let diskcache evict entries that no TTL would accept anymore
+        expire = max(self.cache_ttl_exists, self.cache_ttl_missing)
+        self.persistent_cache.set(cache_key, (exists, time.time()), expire=expire)
+
+    def resource_group_exists(self, subscription_id: str, resource_group: str) -> bool:
+        """
+        Check if a resource group exists
+        
+        Once a resource group is known to be missing, every disk lookup inside
+        it short-circuits without a request.
+        
+        Args:
+            subscription_id: Azure subscription ID
+            resource_group: Name of the resource group
+            
+        Returns:
+            True if the resource group exists or its existence can't be determined
+        """
+        cache_key = (subscription_id, resource_group.lower())
+        with self._cache_lock:
+            if cache_key in self.rg_exists_cache:
+                return self.rg_exists_cache[cache_key]
+        
+        try:
+            resource_client = self._get_resource_client(subscription_id)
+            with self._request_slots:
+                exists = resource_client.resource_groups.check_existence(resource_group)
+        except AzureError:
+            # Not a definitive answer, leave it to the disk lookup
+            return True
+        
+        with self._cache_lock:
+            self.rg_exists_cache[cache_key] = exists
+        return exists
 
     def disk_exists(self, subscription_id: str, source_resource_id: str) -> bool:
         """
@@ -130,31 +505,50 @@ class AzureSnapshotManager:
             True if disk exists, False otherwise
         """
         # Check cache first
-        cache_key = f"{subscription_id}:{source_resource_id}"
-        if cache_key in self.disk_cache:
-            return self.disk_cache[cache_key]
+        cache_key = f"{subscription_id}|{normalize_resource_id(source_resource_id)}"
+        with self._cache_lock:
+            if cache_key in self.disk_cache:
+                return self.disk_cache[cache_key]
+        
+        # Then the answers persisted by previous runs
+        exists = self._get_persisted_lookup(cache_key)
+        if exists is not None:
+            with self._cache_lock:
+                self.disk_cache[cache_key] = exists
+            return exists
         
         # Parse the resource ID to extract resource group and disk name
         # Format: /subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Compute/disks/{name}
-        parts = source_resource_id.split('/')
+        match = RESOURCE_ID_PATTERN.match(source_resource_id)
         
-        # Check if this ID format is valid for a disk
-        if len(parts) < 9 or parts[6] != 'Microsoft.Compute' or parts[7] != 'disks':
-            logger.warning(f"Invalid disk resource ID format: {source_resource_id}")
-            self.disk_cache[cache_key] = False
-            return False
+        # Check if this ID format is valid for a disk (ARM IDs are case-insensitive)
+        if not match or match.group(3).lower() != 'microsoft.compute' or match.group(4).lower() != 'disks':
+            logger.warning("Invalid disk resource ID format: %s", source_resource_id)
+            exists = False
+        elif not self.resource_group_exists(subscription_id, match.group(2)):
+            # The whole resource group is gone, so the disk is too
+            exists = False
+            self._persist_lookup(cache_key, exists)
+        else:
+            resource_group = match.group(2)
+            disk_name = match.group(5)
             
-        resource_group = parts[4]
-        disk_name = parts[8]
+            try:
+                compute_client = self._get_compute_client(subscription_id)
+                with self._request_slots:
+                    compute_client.disks.get(resource_group, disk_name)
+                exists = True
+                self._persist_lookup(cache_key, exists)
+            except ResourceNotFoundError:
+                exists = False
+                self._persist_lookup(cache_key, exists)
+            except AzureError:
+                # Other errors are not a definitive answer, so don't persist them
+                exists = False
         
-        try:
-            compute_client = self._get_compute_client(subscription_id)
-            compute_client.disks.get(resource_group, disk_name)
-            self.disk_cache[cache_key] = True
-            return True
-        except AzureError:
-            self.disk_cache[cache_key] = False
-            return False
+        with self._cache_lock:
+            self.disk_cache[cache_key] = exists
+        return exists
 
     def find_orphaned_snapshots(self) -> List[Dict]:
         """
@@ -163,61 +557,262 @@ class AzureSnapshotManager:
         Returns:
             List of orphaned snapshot dictionaries
         """
-        self.orphaned_snapshots = []
         subscriptions = self.get_subscriptions()
         
-        for subscription in subscriptions:
-            sub_id = subscription['id']
-            logger.info(f"Scanning snapshots in subscription: {subscription['name']} ({sub_id})")
+        self.orphaned_snapshots = self._find_orphans_via_resource_graph(subscriptions)
+        if self.orphaned_snapshots is None:
+            # Scan subscriptions concurrently; each worker returns its own results
+            # so no shared state needs to be locked while merging.
+            with ThreadPoolExecutor(max_workers=self.subscription_workers) as executor:
+                results = executor.map(self._scan_subscription, subscriptions)
+                self.orphaned_snapshots = list(chain.from_iterable(results))
+                
+        logger.info("Found %d orphaned snapshots across all subscriptions", len(self.orphaned_snapshots))
+        
+        # Only walk the results when the per-snapshot details are actually logged
+        if logger.isEnabledFor(logging.DEBUG):
+            for snapshot in self.orphaned_snapshots:
+                logger.debug("Orphaned snapshot %s (source disk %s)", snapshot['id'], snapshot['source_disk_id'])
+        return self.orphaned_snapshots
+
+    def _find_orphans_via_resource_graph(self, subscriptions: List[Dict]) -> Optional[List[Dict]]:
+        """
+        Find orphaned snapshots with a single Resource Graph join
+        
+        All subscriptions are queried together so source disks living in
+        another accessible subscription are still matched.
+        
+        Args:
+            subscriptions: List of subscription dictionaries
             
-            compute_client = self._get_compute_client(sub_id)
+        Returns:
+            List of orphaned snapshot dictionaries, or None if Resource Graph is unavailable
+        """
+        if not subscriptions:
+            return []
             
-            # Get all snapshots in the subscription
-            try:
-                snapshots = list(compute_client.snapshots.list())
-                logger.info(f"Found {len(snapshots)} snapshots in subscription")
-                
-                for snapshot in snapshots:
-                    # Check if snapshot has a source disk property
-                    if hasattr(snapshot, 'creation_data') and \
-                       hasattr(snapshot.creation_data, 'source_resource_id') and \
-                       snapshot.creation_data.source_resource_id:
-                        
-                        source_disk_id = snapshot.creation_data.source_resource_id
-                        
-                        # Check if source disk exists
-                        if not self.disk_exists(sub_id, source_disk_id):
-                            # This is an orphaned snapshot
-                            size_gb = snapshot.disk_size_gb if hasattr(snapshot, 'disk_size_gb') else 0
-                            
-                            # Format creation time
-                            created_time = "Unknown"
-                            if hasattr(snapshot, 'time_created'):
-                                created_time = snapshot.time_created.strftime('%Y-%m-%d %H:%M:%S UTC') \
-                                    if snapshot.time_created else "Unknown"
-                            
-                            # Get snapshot tags
-                            tags = snapshot.tags if hasattr(snapshot, 'tags') and snapshot.tags else {}
-                            
-                            orphaned_snapshot = {
-                                'subscription_id': sub_id,
-                                'subscription_name': subscription['name'],
-                                'resource_group': snapshot.id.split('/')[4],
-                                'name': snapshot.name,
-                                'id': snapshot.id,
-                                'source_disk_id': source_disk_id,
-                                'size_gb': size_gb,
-                                'created_time': created_time,
-                                'tags': tags
-                            }
-                            
-                            self.orphaned_snapshots.append(orphaned_snapshot)
+        subscriptions_by_id = {normalize_resource_id(sub['id']): sub for sub in subscriptions}
+        logger.info("Querying Resource Graph for orphaned snapshots in %d subscription(s)", len(subscriptions))
+        
+        subscription_ids = [sub['id'] for sub in subscriptions]
+        
+        try:
+            orphaned_snapshots = []
+            for row in self._query_resource_graph(subscription_ids, ORPHANED_SNAPSHOTS_QUERY):
+                # Reuse the subscription's strings rather than one copy per row
+                subscription = subscriptions_by_id.get(normalize_resource_id(row['subscriptionId']))
+                orphaned_snapshots.append({
+                    'subscription_id': subscription['id'] if subscription else row['subscriptionId'],
+                    'subscription_name': subscription['name'] if subscription else row['subscriptionId'],
+                    **self._project_graph_row(row)
+                })
+            return orphaned_snapshots
+        except AzureError as e:
+            logger.warning("Resource Graph query failed, falling back to scanning each subscription: %s", e)
+            return None
+
+    def _scan_subscription(self, subscription: Dict) -> Deque[Dict]:
+        """
+        Find orphaned snapshots in a single subscription
+        
+        Args:
+            subscription: Subscription dictionary with 'id' and 'name'
+            
+        Returns:
+            Deque of orphaned snapshot dictionaries for the subscription
+        """
+        sub_id = subscription['id']
+        logger.info("Scanning snapshots in subscription: %s (%s)", subscription['name'], sub_id)
+        
+        compute_client = self._get_compute_client(sub_id)
+        orphaned_snapshots = deque()
+        
+        existing_disks = self._list_disk_ids(sub_id)
+        
+        # Stream snapshots page by page into a bounded queue. The disk check
+        # workers consume it while the next page is fetched, so memory stays
+        # flat no matter how many snapshots the subscription has.
+        pending = queue.Queue(maxsize=SNAPSHOT_QUEUE_SIZE)
+        try:
+            with ThreadPoolExecutor(max_workers=self.disk_workers) as executor:
+                workers = [
+                    executor.submit(self._check_snapshots, subscription, pending, existing_disks)
+                    for _ in range(self.disk_workers)
+                ]
                 
-            except AzureError as e:
-                logger.error(f"Error scanning snapshots in subscription {sub_id}: {str(e)}")
+                snapshot_count = 0
+                try:
+                    for snapshot in compute_client.snapshots.list():
+                        snapshot_count += 1
+                        candidate = self._project_snapshot(snapshot)
+                        if candidate:
+                            pending.put(candidate)
+                finally:
+                    # One sentinel per worker so they all stop once the queue drains
+                    for _ in workers:
+                        pending.put(None)
                 
-        logger.info(f"Found {len(self.orphaned_snapshots)} orphaned snapshots across all subscriptions")
-        return self.orphaned_snapshots
+                orphaned_snapshots = deque(chain.from_iterable(worker.result() for worker in workers))
+            
+            logger.info("Found %d snapshots in subscription %s", snapshot_count, sub_id)
+            
+        except AzureError as e:
+            logger.error("Error scanning snapshots in subscription %s: %s", sub_id, e)
+        
+        return orphaned_snapshots
+
+    @staticmethod
+    def _project_graph_row(row: Dict) -> Dict:
+        """
+        Convert a snapshot row from ORPHANED_SNAPSHOTS_QUERY to a report dictionary
+        
+        Args:
+            row: Resource Graph result row
+            
+        Returns:
+            Snapshot dictionary
+        """
+        # Resource Graph returns ISO 8601 UTC timestamps (2024-01-02T03:04:05.1234567+00:00)
+        time_created = row.get('timeCreated')
+        created_time = f"{time_created[:10]} {time_created[11:19]} UTC" if time_created else "Unknown"
+        
+        return {
+            # Taken from the ID, Resource Graph lower-cases the resourceGroup column
+            'resource_group': sys.intern(RESOURCE_ID_PATTERN.match(row['id']).group(2)),
+            'name': row['name'],
+            'id': row['id'],
+            'source_disk_id': row['sourceResourceId'],
+            'size_gb': row.get('diskSizeGB') or 0,
+            'created_time': created_time,
+            'tags': intern_tags(row.get('tags') or {})
+        }
+
+    @staticmethod
+    def _project_snapshot(snapshot) -> Optional[Dict]:
+        """
+        Reduce an SDK snapshot model to the fields needed for the report
+        
+        Args:
+            snapshot: Snapshot model returned by the compute client
+            
+        Returns:
+            Snapshot dictionary, or None if the snapshot wasn't copied from a disk
+        """
+        # Check if snapshot was copied from a source disk (the compute API
+        # has no server-side filter for this)
+        creation_data = getattr(snapshot, 'creation_data', None)
+        if not creation_data:
+            return None
+        create_option = getattr(creation_data, 'create_option', None)
+        if not create_option or create_option.lower() != COPY_CREATE_OPTION.lower():
+            return None
+        source_disk_id = getattr(creation_data, 'source_resource_id', None)
+        if not source_disk_id:
+            return None
+        
+        size_gb = getattr(snapshot, 'disk_size_gb', 0) or 0
+        
+        # Format creation time from the fields directly, strftime is slow in the hot loop
+        t = getattr(snapshot, 'time_created', None)
+        created_time = (
+            f"{t.year:04d}-{t.month:02d}-{t.day:02d} {t.hour:02d}:{t.minute:02d}:{t.second:02d} UTC"
+            if t else "Unknown"
+        )
+        
+        # Get snapshot tags
+        tags = intern_tags(getattr(snapshot, 'tags', None) or {})
+        
+        return {
+            'resource_group': sys.intern(RESOURCE_ID_PATTERN.match(snapshot.id).group(2)),
+            'name': snapshot.name,
+            'id': snapshot.id,
+            'source_disk_id': source_disk_id,
+            'size_gb': size_gb,
+            'created_time': created_time,
+            'tags': tags
+        }
+
+    def _list_disk_ids(self, subscription_id: str) -> Optional[FrozenSet[str]]:
+        """
+        List the IDs of all disks in a subscription with one paged disks.list() call
+        
+        Args:
+            subscription_id: Azure subscription ID
+            
+        Returns:
+            Frozenset of normalized disk IDs, or None if the disks can't be listed
+        """
+        try:
+            compute_client = self._get_compute_client(subscription_id)
+            return frozenset(normalize_resource_id(disk.id) for disk in compute_client.disks.list())
+        except AzureError as e:
+            logger.warning("Failed to list disks in subscription %s, falling back to per-disk lookups: %s",
+                           subscription_id, e)
+            return None
+
+    def _source_disk_exists(
+        self,
+        subscription_id: str,
+        source_disk_id: str,
+        existing_disks: Optional[FrozenSet[str]]
+    ) -> bool:
+        """
+        Check if the source disk of a snapshot exists
+        
+        Disks in the snapshot's own subscription are looked up in the listed
+        disk IDs; disks in other subscriptions go through disk_exists.
+        
+        Args:
+            subscription_id: Subscription ID of the snapshot
+            source_disk_id: Resource ID of the source disk
+            existing_disks: Disk IDs listed for the subscription, if available
+            
+        Returns:
+            True if disk exists, False otherwise
+        """
+        match = RESOURCE_ID_PATTERN.match(source_disk_id)
+        if not match:
+            # Let disk_exists report the invalid ID
+            return self.disk_exists(subscription_id, source_disk_id)
+            
+        disk_subscription_id = match.group(1)
+        if existing_disks is not None and disk_subscription_id.lower() == subscription_id.lower():
+            return normalize_resource_id(source_disk_id) in existing_disks
+        return self.disk_exists(disk_subscription_id, source_disk_id)
+
+    def _check_snapshots(
+        self,
+        subscription: Dict,
+        pending: queue.Queue,
+        existing_disks: Optional[FrozenSet[str]]
+    ) -> Deque[Dict]:
+        """
+        Worker loop checking queued snapshots for a missing source disk
+        
+        Args:
+            subscription: Subscription dictionary with 'id' and 'name'
+            pending: Queue of snapshot dictionaries, terminated by None
+            existing_disks: Disk IDs listed for the subscription, if available
+            
+        Returns:
+            Deque of orphaned snapshot dictionaries found by this worker
+        """
+        # Workers append without knowing how many orphans they'll find; a deque
+        # grows in fixed-size blocks instead of reallocating like a list
+        orphaned_snapshots = deque()
+        
+        while True:
+            snapshot = pending.get()
+            if snapshot is None:
+                return orphaned_snapshots
+            
+            if not self._source_disk_exists(subscription['id'], snapshot['source_disk_id'], existing_disks):
+                # This is an orphaned snapshot
+                orphaned_snapshots.append({
+                    'subscription_id': subscription['id'],
+                    'subscription_name': subscription['name'],
+                    **snapshot
+                })
 
     def delete_orphaned_snapshots(self, dry_run: bool = True) -> Tuple[int, int]:
         """
@@ -233,38 +828,105 @@ class AzureSnapshotManager:
             logger.info("No orphaned snapshots to delete")
             return (0, 0)
             
-        successful = 0
-        failed = 0
+        if dry_run:
+            for snapshot in self.orphaned_snapshots:
+                logger.info("DRY RUN: Would delete snapshot %s in %s", snapshot['name'], snapshot['resource_group'])
+            return (len(self.orphaned_snapshots), 0)
         
-        for snapshot in self.orphaned_snapshots:
-            sub_id = snapshot['subscription_id']
-            resource_group = snapshot['resource_group']
-            snapshot_name = snapshot['name']
+        # Run the long-running deletions in parallel instead of waiting for each
+        # one before starting the next. Per subscription, a semaphore caps how many
+        # are in flight and a token bucket how fast new ones are started.
+        subscription_ids = {snapshot['subscription_id'] for snapshot in self.orphaned_snapshots}
+        delete_slots = {sub_id: threading.BoundedSemaphore(self.delete_workers) for sub_id in subscription_ids}
+        delete_buckets = {sub_id: TokenBucket(self.delete_rate) for sub_id in subscription_ids}
+        max_workers = min(len(self.orphaned_snapshots), self.delete_workers * len(subscription_ids))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda snapshot: self._delete_snapshot(
+                    snapshot,
+                    delete_slots[snapshot['subscription_id']],
+                    delete_buckets[snapshot['subscription_id']]
+                ),
+                self.orphaned_snapshots
+            ))
+        
+        successful = sum(results)
+        return (successful, len(results) - successful)
+
+    def _delete_snapshot(
+        self,
+        snapshot: Dict,
+        delete_slots: threading.BoundedSemaphore,
+        delete_bucket: TokenBucket
+    ) -> bool:
+        """
+        Delete a single snapshot and wait for the operation to complete
+        
+        Args:
+            snapshot: Orphaned snapshot dictionary
+            delete_slots: Semaphore limiting concurrent deletions in the subscription
+            delete_bucket: Token bucket limiting the deletion rate in the subscription
             
+        Returns:
+            True if the snapshot was deleted, False otherwise
+        """
+        resource_group = snapshot['resource_group']
+        snapshot_name = snapshot['name']
+        
+        with delete_slots:
             try:
-                if dry_run:
-                    logger.info(f"DRY RUN: Would delete snapshot {snapshot_name} in {resource_group}")
-                    successful += 1
-                else:
-                    logger.info(f"Deleting snapshot {snapshot_name} in {resource_group}")
-                    compute_client = self._get_compute_client(sub_id)
-                    
-                    # Start the deletion operation
-                    delete_operation = compute_client.snapshots.begin_delete(
-                        resource_group,
-                        snapshot_name
-                    )
-                    
-                    # Wait for the operation to complete
-                    delete_operation.wait()
-                    
-                    logger.info(f"Successfully deleted snapshot {snapshot_name}")
-                    successful += 1
-            except AzureError as e:
-                logger.error(f"Failed to delete snapshot {snapshot_name}: {str(e)}")
-                failed += 1
+                logger.info("Deleting snapshot %s in %s", snapshot_name, resource_group)
+                compute_client = self._get_compute_client(snapshot['subscription_id'])
                 
-        return (successful, failed)
+                # Start the deletion operation and wait for it to complete
+                delete_operation = self._begin_delete(compute_client, resource_group, snapshot_name, delete_bucket)
+                delete_operation.wait(timeout=self.delete_timeout)
+            except AzureError as e:
+                logger.error("Failed to delete snapshot %s: %s", snapshot_name, e)
+                return False
+        
+        if not delete_operation.done():
+            logger.error("Timed out waiting for deletion of snapshot %s", snapshot_name)
+            return False
+            
+        logger.info("Successfully deleted snapshot %s", snapshot_name)
+        return True
+
+    @staticmethod
+    def _begin_delete(
+        compute_client: ComputeManagementClient,
+        resource_group: str,
+        snapshot_name: str,
+        delete_bucket: TokenBucket
+    ):
+        """
+        Start a snapshot deletion within the subscription's rate limit
+        
+        The SDK retry policy already waits out Retry-After on the first 429s.
+        If a deletion is still throttled after that, every deletion in the
+        subscription is held back for exactly the requested delay before
+        retrying, rather than backing off exponentially on top.
+        
+        Args:
+            compute_client: Compute client for the snapshot's subscription
+            resource_group: Resource group of the snapshot
+            snapshot_name: Name of the snapshot
+            delete_bucket: Token bucket limiting the deletion rate in the subscription
+            
+        Returns:
+            Poller for the deletion operation
+        """
+        for attempt in range(DELETE_THROTTLE_RETRIES + 1):
+            delete_bucket.acquire()
+            try:
+                return compute_client.snapshots.begin_delete(resource_group, snapshot_name)
+            except HttpResponseError as e:
+                if e.status_code != 429 or attempt == DELETE_THROTTLE_RETRIES:
+                    raise
+                retry_after = get_retry_after(e)
+                logger.warning("Throttled deleting snapshot %s, retrying in %.0f seconds", snapshot_name, retry_after)
+                delete_bucket.pause(retry_after)
 
     def export_to_json(self, file_path: str) -> None:
         """
@@ -277,16 +939,26 @@ class AzureSnapshotManager:
             logger.info("No orphaned snapshots to export")
             return
             
+        # Use orjson when available, it is much faster than the stdlib encoder
+        if orjson:
+            dumps = orjson.dumps
+        else:
+            dumps = lambda obj: json.dumps(obj).encode('utf-8')
+            
         try:
-            with open(file_path, 'w') as f:
-                json.dump({
-                    'generated_at': datetime.datetime.utcnow().isoformat(),
-                    'orphaned_snapshots': self.orphaned_snapshots
-                }, f, indent=2)
+            # Write the document one record per line rather than encoding it
+            # as a single string, so memory stays flat for large reports
+            with open(file_path, 'wb') as f:
+                generated_at = dumps(datetime.datetime.utcnow().isoformat())
+                f.write(b'{"generated_at": ' + generated_at + b', "orphaned_snapshots": [')
+                for i, snapshot in enumerate(self.orphaned_snapshots):
+                    f.write(b'\n  ' if i == 0 else b',\n  ')
+                    f.write(dumps(snapshot))
+                f.write(b'\n]}\n')
                 
-            logger.info(f"Exported {len(self.orphaned_snapshots)} orphaned snapshots to {file_path}")
+            logger.info("Exported %d orphaned snapshots to %s", len(self.orphaned_snapshots), file_path)
         except Exception as e:
-            logger.error(f"Failed to export to JSON: {str(e)}")
+            logger.error("Failed to export to JSON: %s", e)
 
     def print_summary(self) -> None:
         """Print a summary of the found orphaned snapshots"""
@@ -294,24 +966,23 @@ class AzureSnapshotManager:
             logger.info("No orphaned snapshots found")
             return
             
-        total_size_gb = sum(s['size_gb'] for s in self.orphaned_snapshots if s['size_gb'])
+        # Total and per-subscription [count, size] in a single pass
+        total_size_gb = 0
+        by_sub = defaultdict(lambda: [0, 0])
+        for snapshot in self.orphaned_snapshots:
+            size_gb = snapshot['size_gb'] or 0
+            totals = by_sub[snapshot['subscription_name']]
+            totals[0] += 1
+            totals[1] += size_gb
+            total_size_gb += size_gb
         
         print("\n=== Orphaned Snapshots Summary ===")
         print(f"Total orphaned snapshots: {len(self.orphaned_snapshots)}")
         print(f"Total size: {total_size_gb} GB")
         
-        # Group by subscription
-        by_sub = {}
-        for snapshot in self.orphaned_snapshots:
-            sub_name = snapshot['subscription_name']
-            if sub_name not in by_sub:
-                by_sub[sub_name] = []
-            by_sub[sub_name].append(snapshot)
-        
         print("\nBreakdown by subscription:")
-        for sub_name, snapshots in by_sub.items():
-            sub_size = sum(s['size_gb'] for s in snapshots if s['size_gb'])
-            print(f"  - {sub_name}: {len(snapshots)} snapshots, {sub_size} GB")
+        for sub_name, (count, sub_size) in by_sub.items():
+            print(f"  - {sub_name}: {count} snapshots, {sub_size} GB")
 
     def print_snapshots(self) -> None:
         """Print details of the found orphaned snapshots in tabular format"""
@@ -367,7 +1038,16 @@ def get_credential(auth_method: str, sp_client_id: str = None, sp_client_secret:
         if not all([sp_client_id, sp_client_secret, sp_tenant_id]):
             raise ValueError("Service principal authentication requires client ID, client secret, and tenant ID")
         logger.info("Using Service Principal authentication")
-        return ClientSecretCredential(sp_tenant_id, sp_client_id, sp_client_secret)
+        
+        # Optionally keep tokens in the persistent MSAL cache so later runs skip
+        # token acquisition. CLI auth already reuses the Azure CLI's own cache.
+        credential_options = {}
+        if os.environ.get("AZURE_TOKEN_CACHE") == "1":
+            logger.info("Using persistent token cache")
+            credential_options['token_cache_persistence_options'] = TokenCachePersistenceOptions(
+                name=TOKEN_CACHE_NAME
+            )
+        return ClientSecretCredential(sp_tenant_id, sp_client_id, sp_client_secret, **credential_options)
     else:
         raise ValueError(f"Unsupported authentication method: {auth_method}")
 
@@ -399,6 +1079,67 @@ def main():
         help="Service Principal Tenant ID (for service-principal auth)"
     )
     
+    # Tuning options
+    tuning_group = parser.add_argument_group("Tuning")
+    tuning_group.add_argument(
+        "--subscription-workers",
+        type=int,
+        default=DEFAULT_SUBSCRIPTION_WORKERS,
+        help=f"Number of subscriptions scanned concurrently (default: {DEFAULT_SUBSCRIPTION_WORKERS})"
+    )
+    tuning_group.add_argument(
+        "--disk-workers",
+        type=int,
+        default=DEFAULT_DISK_WORKERS,
+        help=f"Number of concurrent disk lookups per subscription; lower this if ARM "
+             f"returns HTTP 429 (default: {DEFAULT_DISK_WORKERS})"
+    )
+    tuning_group.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help=f"Maximum number of disk lookups in flight across all subscriptions "
+             f"(default: {DEFAULT_MAX_IN_FLIGHT})"
+    )
+    
+    tuning_group.add_argument(
+        "--delete-workers",
+        type=int,
+        default=DEFAULT_DELETE_WORKERS,
+        help=f"Number of concurrent deletions per subscription (default: {DEFAULT_DELETE_WORKERS})"
+    )
+    tuning_group.add_argument(
+        "--delete-rate",
+        type=int,
+        default=DEFAULT_DELETE_RATE,
+        help=f"Maximum number of deletions started per minute per subscription (default: {DEFAULT_DELETE_RATE})"
+    )
+    
+    # Cache options
+    cache_group = parser.add_argument_group("Cache")
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't reuse or persist disk lookups between runs"
+    )
+    cache_group.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the persistent disk lookup cache (default: {DEFAULT_CACHE_DIR})"
+    )
+    cache_group.add_argument(
+        "--cache-ttl-exists",
+        type=int,
+        default=DEFAULT_CACHE_TTL_EXISTS,
+        help=f"Seconds a cached 'disk exists' answer stays valid (default: {DEFAULT_CACHE_TTL_EXISTS})"
+    )
+    cache_group.add_argument(
+        "--cache-ttl-missing",
+        type=int,
+        default=DEFAULT_CACHE_TTL_MISSING,
+        help=f"Seconds a cached 'disk missing' answer stays valid (default: {DEFAULT_CACHE_TTL_MISSING})"
+    )
+    
     # Operation options
     parser.add_argument(
         "--subscription-id",
@@ -437,42 +1178,50 @@ def main():
         )
         
         # Create snapshot manager
-        snapshot_manager = AzureSnapshotManager(
+        with AzureSnapshotManager(
             credential,
             subscription_id=args.subscription_id,
-            log_level=args.log_level
-        )
-        
-        # Find orphaned snapshots
-        orphaned_snapshots = snapshot_manager.find_orphaned_snapshots()
+            log_level=args.log_level,
+            subscription_workers=args.subscription_workers,
+            disk_workers=args.disk_workers,
+            max_in_flight=args.max_in_flight,
+            delete_workers=args.delete_workers,
+            delete_rate=args.delete_rate,
+            use_cache=not args.no_cache,
+            cache_dir=args.cache_dir,
+            cache_ttl_exists=args.cache_ttl_exists,
+            cache_ttl_missing=args.cache_ttl_missing
+        ) as snapshot_manager:
+            # Find orphaned snapshots
+            orphaned_snapshots = snapshot_manager.find_orphaned_snapshots()
         
-        # Print summary and details
-        snapshot_manager.print_summary()
-        snapshot_manager.print_snapshots()
+            # Print summary and details
+            snapshot_manager.print_summary()
+            snapshot_manager.print_snapshots()
         
-        # Export to JSON if requested
-        if args.export:
-            snapshot_manager.export_to_json(args.export)
+            # Export to JSON if requested
+            if args.export:
+                snapshot_manager.export_to_json(args.export)
         
-        # Delete orphaned snapshots if requested
-        if args.delete or args.dry_run:
-            dry_run = True if args.dry_run else False
-            if args.delete and not args.dry_run:
-                confirmation = input("\nWARNING: This will delete orphaned snapshots. Continue? [y/N]: ")
-                if confirmation.lower() != 'y':
-                    logger.info("Deletion cancelled")
-                    return 0
+            # Delete orphaned snapshots if requested
+            if args.delete or args.dry_run:
+                dry_run = True if args.dry_run else False
+                if args.delete and not args.dry_run:
+                    confirmation = input("\nWARNING: This will delete orphaned snapshots. Continue? [y/N]: ")
+                    if confirmation.lower() != 'y':
+                        logger.info("Deletion cancelled")
+                        return 0
             
-            success, failed = snapshot_manager.delete_orphaned_snapshots(dry_run=dry_run)
+                success, failed = snapshot_manager.delete_orphaned_snapshots(dry_run=dry_run)
             
-            print("\n=== Deletion Results ===")
-            print(f"Successful: {success}")
-            print(f"Failed: {failed}")
+                print("\n=== Deletion Results ===")
+                print(f"Successful: {success}")
+                print(f"Failed: {failed}")
         
         return 0
         
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
 
 